@@ -4,64 +4,189 @@ Streaming, resumable compute of McCrackn’s motif table (fast residue-based).
 
 Usage:
     python compute_motifs.py --n 5000000 --csv motifs_5m.csv --state state.json
+    python compute_motifs.py --n 5000000 --csv motifs_5m.csv --state state.pkl
+    python compute_motifs.py --n 5000000 --csv motifs_5m.csv --jobs 8
 
 This script generates a CSV file of primes and their associated motifs using
 McCrackn’s Prime Law. It supports resumable operation by saving state
-to a JSON file. Ideal for long computations that may need to be restarted.
+to a JSON file (``state.json`` by default), or to a pickle for any other
+path. Ideal for long computations that may need to be restarted.
+
+With ``--jobs K`` (K > 1) the primes come from a segmented sieve run over
+windows in K worker processes instead of from the law itself; the rows are
+identical, since the law reproduces the primes and labels each gap with
+its canonical motif.
 """
 
 import argparse
-import csv
 import json
 import os
+import pickle
 import time
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
 from mccrackns_prime_law import McCracknsPrimeLaw
+from numbers_domains import NumbersDomains
+from src.prime_utils import nth_prime_bound, segmented_sieve
+
+BATCH_ROWS   = 1 << 16  # rows buffered before a single write()
+WRITE_BUFFER = 1 << 20  # bytes of file-object buffering; a full batch is
+                        # larger and goes to the OS in one write() call
+SEED_PRIMES  = 6        # stream_primes starts after the law's seed primes
+SIEVE_WINDOW = 1 << 22  # integers per sieve window handed to a worker
+WINDOWS_PER_JOB = 2     # windows in flight (queued or done) per worker
+CHECKPOINT_ROWS = 1 << 20  # rows between periodic state snapshots
 
 
 # ───────────────────────── helpers ──────────────────────────
 
+def read_state(state_path: str) -> dict:
+    """
+    Load a resume-state snapshot; ``.json`` paths are read as JSON,
+    anything else as a pickle.
+    """
+    if state_path.endswith(".json"):
+        with open(state_path, encoding="utf-8") as f:
+            return json.load(f)
+    with open(state_path, "rb") as f:
+        return pickle.load(f)
+
+
+def write_state(state: dict, state_path: str):
+    """
+    Write a resume-state snapshot atomically: the data goes to a ``.tmp``
+    sibling first and is renamed over ``state_path``, so a crash mid-save
+    leaves the previous snapshot intact.
+    """
+    tmp_path = state_path + ".tmp"
+    if state_path.endswith(".json"):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+    else:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, state_path)
+
+
+def count_rows(csv_path: str) -> int:
+    """
+    Count the data rows of a CSV (header excluded) by counting line breaks
+    in raw ``WRITE_BUFFER``-sized blocks, without decoding any lines.
+    """
+    lines, tail = 0, b"\n"
+    with open(csv_path, "rb") as f:
+        while block := f.read(WRITE_BUFFER):
+            lines += block.count(b"\n")
+            tail = block[-1:]
+    if tail != b"\n":
+        lines += 1  # unterminated last line
+    return lines - 1  # subtract header row
+
+
 def load_progress(csv_path: str, state_path: str):
     """
     Check if output files exist and load previous progress.
 
+    The row count recorded in the state is trusted when the CSV still has
+    the size it had at the snapshot. A CSV that grew past the snapshot
+    (a run interrupted between checkpoints, possibly mid-line) is cut
+    back to it; a CSV that shrank has its rows counted.
+
     Args:
         csv_path (str): Path to the CSV output file.
-        state_path (str): Path to the JSON state file.
+        state_path (str): Path to the resume-state file.
 
     Returns:
         Tuple[int, dict|None]: Number of primes already written and the saved state.
     """
     if os.path.exists(csv_path) and os.path.exists(state_path):
-        with open(csv_path, encoding="utf-8") as f:
-            written = sum(1 for _ in f) - 1  # subtract header row
-        with open(state_path, encoding="utf-8") as f:
-            state = json.load(f)
+        state = read_state(state_path)
+        size = os.path.getsize(csv_path)
+        if "rows_written" in state and state.get("csv_size", size + 1) <= size:
+            if state["csv_size"] < size:
+                os.truncate(csv_path, state["csv_size"])
+                print(f"[RESUME] dropped {size - state['csv_size']} bytes "
+                      f"written after the last snapshot", flush=True)
+            written = state["rows_written"]
+        else:
+            written = count_rows(csv_path)
         print(f"[RESUME] CSV rows={written} — state loaded.", flush=True)
         return written, state
     print(f"[START ] fresh run — creating {csv_path}", flush=True)
     return 0, None
 
 
-def save_state(law: McCracknsPrimeLaw, state_path: str):
+def save_state(state_path: str, csv_path: str, rows_written: int,
+               last_prime: int, regime_points: list[int] | None = None):
     """
-    Save current generation state to a JSON file.
+    Save current generation state to the resume-state file.
 
     Args:
-        law (McCracknsPrimeLaw): Instance containing state data.
         state_path (str): Path to the state file.
+        csv_path (str): Path to the CSV output file.
+        rows_written (int): Data rows in the CSV (header excluded).
+        last_prime (int): Last prime written.
+        regime_points (list[int] | None): The law's regime points; ``None``
+            for sieve runs, which never build a law.
     """
-    with open(state_path, "w", encoding="utf-8") as f:
-        json.dump(
-            {
-                "last_prime":    law.primes[-1],
-                "regime_points": law.regime_points,
-            },
-            f,
-            indent=2,
-        )
+    state = {
+        "last_prime":    last_prime,
+        "rows_written":  rows_written,
+        "csv_size":      os.path.getsize(csv_path),
+    }
+    if regime_points is not None:
+        state["regime_points"] = regime_points
+    write_state(state, state_path)
     print(f"[STATE ] snapshot saved → {state_path}", flush=True)
 
 
+def _sieve_window(bounds: tuple[int, int]) -> list[int]:
+    """Worker: return the primes in the inclusive window ``bounds``."""
+    lo, hi = bounds
+    return list(segmented_sieve(hi, lo))
+
+
+def sieve_rows(N: int, start_idx: int, jobs: int):
+    """
+    Yield ``(index, prime, gap, motif)`` rows like ``stream_primes``, with
+    the primes sieved in parallel.
+
+    ``[0, p_N]`` is cut into windows of ``SIEVE_WINDOW`` integers sieved by
+    a process pool. At most ``jobs * WINDOWS_PER_JOB`` windows are in
+    flight at once, so memory stays bounded for any ``N``; the results are
+    taken in window order and labelled sequentially here.
+
+    Args:
+        N (int): Index of the last row.
+        start_idx (int): First index to yield (never below the law's first
+            streamed index).
+        jobs (int): Worker processes.
+    """
+    start_idx = max(start_idx, SEED_PRIMES + 1)
+    limit = nth_prime_bound(N)
+    windows = ((lo, min(lo + SIEVE_WINDOW - 1, limit))
+               for lo in range(0, limit + 1, SIEVE_WINDOW))
+    motif = NumbersDomains().canonical_motif
+
+    idx, prev = 0, 0
+    with Pool(jobs) as pool:
+        pending = deque(pool.apply_async(_sieve_window, (w,))
+                        for w in islice(windows, jobs * WINDOWS_PER_JOB))
+        while pending:
+            chunk = pending.popleft().get()
+            w = next(windows, None)  # refill the slot just taken
+            if w is not None:
+                pending.append(pool.apply_async(_sieve_window, (w,)))
+            for p in chunk:
+                idx += 1
+                if idx >= start_idx:
+                    yield idx, p, p - prev, motif(p - prev)
+                    if idx >= N:
+                        return
+                prev = p
+
+
 # ───────────────────────── main ─────────────────────────────
 
 def main() -> None:
@@ -74,7 +199,9 @@ def main() -> None:
     ap.add_argument("--n",     type=int, required=True, help="# primes to export")
     ap.add_argument("--csv",   type=str, required=True, help="output CSV file")
     ap.add_argument("--state", type=str, default="state.json",
-                    help="JSON resume-state file")
+                    help="resume-state file (JSON if it ends in .json, else pickle)")
+    ap.add_argument("--jobs",  type=int, default=1,
+                    help="worker processes; >1 sieves the primes in parallel")
     args = ap.parse_args()
 
     N, csv_path, state_path = args.n, args.csv, args.state
@@ -85,53 +212,81 @@ def main() -> None:
         print(f"[DONE  ] already exported {done} ≥ requested {N}", flush=True)
         return
 
-    # Instantiate McCrackn’s Prime Law up to N primes
-    law = McCracknsPrimeLaw(n_primes=N, verbose=False)
+    if args.jobs > 1:
+        # sieve mode: no law to replay, resuming just skips written rows
+        law = None
+        rows_iter = sieve_rows(N, done + 1, args.jobs)
+    else:
+        # Instantiate McCrackn’s Prime Law up to N primes
+        law = McCracknsPrimeLaw(n_primes=N, verbose=False)
+        rows_iter = law.stream_primes(start_idx=done + 1)
 
     # ---------- fast-forward to resume point ----------
-    if saved:
-        law.regime_points = saved.get("regime_points", [6])
+    # the written prefix is re-fed from a sieve rather than re-searched;
+    # regime_points are rebuilt along the way, not restored from state
+    if saved and law is not None:
         print(f"[CATCH ] fast-forwarding to idx={done} …", flush=True)
         t0 = time.perf_counter()
-        for _ in range(len(law.primes), done):
-            law.generate_one()
+        law.bootstrap_from_sieve(
+            islice(segmented_sieve(nth_prime_bound(done)), done))
         print(f"[CATCH ] done in {time.perf_counter() - t0:.1f}s", flush=True)
 
     # ---------- CSV streaming mode ----------
     new_file = not os.path.exists(csv_path)
-    with open(csv_path, "a" if not new_file else "w",
-              newline="", encoding="utf-8") as fh:
-        wr = csv.writer(fh)
-
+    with open(csv_path, "ab" if not new_file else "wb",
+              buffering=WRITE_BUFFER) as fh:
         # Write header if it's a new file
         if new_file:
-            wr.writerow(["index", "prime", "gap", "motif"])
+            fh.write(b"index,prime,gap,motif\r\n")
+
+        buf  = []    # pending rows, joined and written once per batch
+        rows = done  # data rows in the file once buf is written
 
         total  = N - done
         every  = max(total // 200, 1)  # ~0.5% progress intervals
         start  = time.perf_counter()
 
-        # Stream generation and write rows incrementally
-        for idx, p, g, m in law.stream_primes(start_idx=done + 1):
-            wr.writerow([idx, p, g, m])
+        # Stream generation and write rows in batches; motif labels are
+        # plain ASCII, so rows need no CSV quoting (\r\n as csv.writer does)
+        last = saved["last_prime"] if saved else None
+        regime_points = law.regime_points if law is not None else None
+        next_checkpoint = done + CHECKPOINT_ROWS
+        try:
+            for idx, p, g, m in rows_iter:
+                buf.append(f"{idx},{p},{g},{m}\r\n")
+                last = p
 
-            if idx % 1000 == 0:
-                fh.flush()  # reduce data loss risk on crash
+                if len(buf) >= BATCH_ROWS:
+                    fh.write("".join(buf).encode("ascii"))
+                    rows += len(buf)
+                    buf.clear()
+                    # periodic snapshot, so a crash costs at most
+                    # CHECKPOINT_ROWS rows of recomputation
+                    if rows >= next_checkpoint:
+                        fh.flush()
+                        os.fsync(fh.fileno())
+                        save_state(state_path, csv_path, rows, last, regime_points)
+                        next_checkpoint = rows + CHECKPOINT_ROWS
 
-            # Print progress every ~0.5% or final write
-            if (idx - done) % every == 0 or idx == N:
-                elapsed = time.perf_counter() - start
-                pct = (idx - done) / total * 100
-                eta = elapsed * (total - (idx - done)) / max(idx - done, 1)
-                print(f"[WRITE ] {idx}/{N} ({pct:5.1f} %) | "
-                      f"elapsed {elapsed:6.1f}s | ETA {eta:6.1f}s",
-                      flush=True)
+                # Print progress every ~0.5% or final write
+                if (idx - done) % every == 0 or idx == N:
+                    elapsed = time.perf_counter() - start
+                    pct = (idx - done) / total * 100
+                    eta = elapsed * (total - (idx - done)) / max(idx - done, 1)
+                    print(f"[WRITE ] {idx}/{N} ({pct:5.1f} %) | "
+                          f"elapsed {elapsed:6.1f}s | ETA {eta:6.1f}s",
+                          flush=True)
 
-            if idx >= N:
-                break
+                if idx >= N:
+                    break
+        finally:
+            # also on Ctrl-C or an error: keep every buffered row and
+            # save state for future resume
+            fh.write("".join(buf).encode("ascii"))
+            rows += len(buf)
+            fh.flush()
+            save_state(state_path, csv_path, rows, last, regime_points)
 
-    # Save state for future resume
-    save_state(law, state_path)
     print(f"✅  CSV complete up to n={N}", flush=True)
 
 
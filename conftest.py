@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Make the repository root (the law modules and the src package) importable
+# for every test module, however pytest is invoked
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -17,8 +17,62 @@ stepwise and stream-based generation.
 Dependencies:
 - `numbers_domains.py` must provide `NumbersDomains.canonical_motif(gap: int) -> str`
 """
+import sys
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
 from math import gcd
 from numbers_domains import NumbersDomains
+
+_PREFILTER_PRIMES = 5  # primorial factors above 7 tried by plain modulo
+
+# Seed prefix 2, 3, 5, 7, 11, 13 as precomputed columns: gaps, motif names by
+# code, and the code and run count of each record (the leading "U1" included).
+_SEED_PRIMES = (2, 3, 5, 7, 11, 13)
+_SEED_GAPS   = (1, 2, 2, 4, 2)
+_SEED_NAMES  = tuple(sys.intern(lbl) for lbl in ("U1", "E1.0", "E1.1"))
+_SEED_CODES  = (0, 0, 1, 1, 2, 1)
+_SEED_RUNS   = (1, 2, 1, 2, 1, 3)
+
+# Candidates are pre-screened on a wheel modulo 2·3·5·7. Its effective base
+# is gcd(primorial, 210): only factors already in the primorial may be used
+# to skip a candidate, or the scan would diverge from the gcd test.
+_WHEEL_MOD = 210
+
+
+@lru_cache(maxsize=None)
+def _coprime_flags(base: int) -> bytes:
+    """Flag, for each residue mod 210, whether it is coprime to ``base``."""
+    return bytes(gcd(s, base) == 1 for s in range(_WHEEL_MOD))
+
+
+def _first_coprime(p_curr: int, gaps: list, order: list, P: int,
+                   small_primes: list, start: int = 0) -> int:
+    """
+    Scan ``order`` (indices into ``gaps``) from position ``start`` for the
+    first candidate ``p_curr + gap`` coprime to the primorial ``P``.
+
+    This is the numeric core of a step: plain integers in, a position out,
+    with all motif-label bookkeeping left to the caller. ``order`` holds
+    only the gaps that put the candidate on the wheel; the remaining
+    composites are mostly rejected by single-word modulo against
+    ``small_primes`` (factors of ``P``), and only the survivors pay for the
+    multi-limb ``gcd``.
+
+    Returns:
+        int: Position in ``order``, or -1 if no candidate survives.
+    """
+    for j in range(start, len(order)):
+        cand = p_curr + gaps[order[j]]
+        for sp in small_primes:
+            if cand % sp == 0:
+                break
+        else:
+            if gcd(cand, P) == 1:
+                return j
+    return -1
+
+
 class McCracknsPrimeLaw:
     """
     A deterministic prime generator using motif-regime logic.
@@ -29,6 +83,9 @@ class McCracknsPrimeLaw:
         progress_every (int): Print progress every N primes if verbose is enabled.
     """
 
+    # label -> (gap, k, x) sort key, shared by all instances
+    _LABEL_KEY_CACHE: dict[str, tuple] = {}
+
     def __init__(self, *, n_primes: int = 100, verbose: bool = False,
                  progress_every: int = 1000):
         # User configuration
@@ -36,24 +93,30 @@ class McCracknsPrimeLaw:
         self.verbose        = verbose
         self.progress_every = max(1, progress_every)
 
-        # Seed primes and motifs
-        seed_primes = [2, 3, 5, 7, 11, 13]
-        self.primes = seed_primes[:self.n_primes]
-        seed_gaps   = [1, 2, 2, 4, 2]
-        seed_labels = ["U1", "E1.0", "E1.0", "E1.1", "E1.0"]
-
-        self.gaps   = seed_gaps[:len(self.primes) - 1]
-        self.motifs = [("U1", 1)]  # (motif_label, run_count)
-        self._run_counter = {"U1": 1, "E1.0": 0, "E1.1": 0}
-        for lbl in seed_labels[:len(self.primes) - 1]:
-            run = self._run_counter.get(lbl, 0) + 1
-            self._run_counter[lbl] = run
-            self.motifs.append((lbl, run))
+        # Seed primes and motifs; primes and gaps are kept as packed
+        # machine-word arrays (uint64 / uint16) rather than lists of ints;
+        # prime gaps stay far below 2**16 until primes reach ~10**18
+        self.primes = array("Q", _SEED_PRIMES[:self.n_primes])
+        k = len(self.primes)
+        self.gaps   = array("H", _SEED_GAPS[:k - 1])
+        # motif records as parallel columns: a dense integer code per
+        # distinct label (decoded through _motif_names) and its run count.
+        # Labels are interned where they are created (the seed names here,
+        # NumbersDomains.canonical_motif for the rest), so label dicts and
+        # sets compare by identity.
+        self._motif_names = list(_SEED_NAMES)  # code -> label
+        self._motif_code  = {lbl: c for c, lbl in enumerate(_SEED_NAMES)}
+        self.motif_codes  = array("I", _SEED_CODES[:k])
+        self.motif_runs   = array("I", _SEED_RUNS[:k])
+        # code -> occurrences so far (runs count up from 1, so the tally)
+        self._code_runs   = [self.motif_codes.count(c) for c in range(len(_SEED_NAMES))]
 
         self.domains        = NumbersDomains()
         self.regime_idx     = 1
         self.primorial      = 2 * 3
-        self.alphabet       = ["U1", "E1.0"]  # active motif set
+        self._prefilter_primes = []  # primorial factors above 7
+        self._wheel_base       = gcd(self.primorial, _WHEEL_MOD)
+        self.alphabet       = list(_SEED_NAMES[:2])  # active motif set
         self._sort_alpha()
         self.used_motifs    = set(self.alphabet)
         self.regime_points  = []
@@ -77,22 +140,81 @@ class McCracknsPrimeLaw:
             return 1 << (x + 1)  # 2^(x+1)
         return (1 << (k - 1)) * (2 * x + 3)
 
+    @classmethod
+    def _label_key(cls, label: str) -> tuple:
+        """
+        Sort key of a motif label: its gap, then the label's numeric parts.
+        Parsed once per distinct label and cached on the class.
+        """
+        key = cls._LABEL_KEY_CACHE.get(label)
+        if key is None:
+            key = (cls._gap(label),) + tuple(map(int, label[1:].split(".")))
+            cls._LABEL_KEY_CACHE[label] = key
+        return key
+
+    def _register(self, label: str) -> int:
+        """Return the code of ``label``, assigning the next one on first sight."""
+        code = self._motif_code.get(label)
+        if code is None:
+            code = self._motif_code[label] = len(self._motif_names)
+            self._motif_names.append(label)
+            self._code_runs.append(0)
+        return code
+
     def _sort_alpha(self):
-        """Sort the current alphabet based on motif gap and label specificity."""
-        self.alphabet.sort(
-            key=lambda lbl: (self._gap(lbl),) + tuple(map(int, lbl[1:].split(".")))
-        )
+        """
+        Sort the current alphabet based on motif gap and label specificity,
+        and rebuild the parallel array of numeric gaps and the per-residue
+        candidate orders.
+        """
+        self.alphabet.sort(key=self._label_key)
+        self._alphabet_gaps = [self._LABEL_KEY_CACHE[lbl][0] for lbl in self.alphabet]
+        self._build_wheel()
+
+    def _build_wheel(self):
+        """
+        Reset the per-residue candidate orders for the current wheel base.
+        ``_wheel_order[r]`` lists the indices of the gaps ``g`` for which
+        ``r + g`` is coprime to the base, ``r`` being a residue mod 210;
+        each order is built by ``_wheel_for`` the first time ``r`` is seen.
+        """
+        self._wheel_coprime = _coprime_flags(self._wheel_base)
+        self._wheel_order = {}
+
+    def _wheel_for(self, r: int) -> list:
+        """Build and store the candidate order for residue ``r``."""
+        coprime = self._wheel_coprime
+        order = self._wheel_order[r] = [
+            i for i, g in enumerate(self._alphabet_gaps)
+            if coprime[(r + g) % _WHEEL_MOD]
+        ]
+        return order
+
+    def _extend_alpha(self, label: str):
+        """
+        Append a motif whose gap exceeds every gap in the alphabet (as
+        ``_next_motif`` guarantees), updating the gap array and the
+        per-residue candidate orders in place instead of re-sorting.
+        """
+        gap = self._label_key(label)[0]
+        i = len(self.alphabet)
+        self._register(label)
+        self.alphabet.append(label)
+        self._alphabet_gaps.append(gap)
+        coprime = self._wheel_coprime
+        for r, order in self._wheel_order.items():
+            if coprime[(r + gap) % _WHEEL_MOD]:
+                order.append(i)
 
     def _next_motif(self) -> str:
         """
-        Compute the next unused motif by scanning upward in gap size.
+        Compute the next unused motif: the one for the next even gap above
+        the largest gap in the alphabet.
+
+        Every even gap has its own canonical label and the alphabet is sorted
+        by gap, so that label can never already be in the alphabet.
         """
-        g = self._gap(self.alphabet[-1]) + 2
-        while True:
-            lbl = self.domains.canonical_motif(g)
-            if lbl != "U1" and lbl not in self.alphabet:
-                return lbl
-            g += 2
+        return self.domains.canonical_motif(self._alphabet_gaps[-1] + 2)
 
     def _bump_regime(self):
         """
@@ -100,74 +222,170 @@ class McCracknsPrimeLaw:
         Update regime index, primorial, and ensure alignment with sequence length.
         """
         self.regime_points.append(len(self.primes))
-        self.alphabet.append(self._next_motif())
-        self._sort_alpha()
+        self._extend_alpha(self._next_motif())
 
         self.regime_idx += 1
         while len(self.primes) <= self.regime_idx:
             self._single_step(internal=True)
         self.primorial *= self.primes[self.regime_idx]
+        if self.primes[self.regime_idx] > 7 and \
+           len(self._prefilter_primes) < _PREFILTER_PRIMES:
+            self._prefilter_primes.append(self.primes[self.regime_idx])
+        base = gcd(self.primorial, _WHEEL_MOD)
+        if base != self._wheel_base:
+            self._wheel_base = base
+            self._build_wheel()
         self.used_motifs.clear()
 
     def _record(self, cand: int, gap: int, label: str):
         """
         Finalize candidate as next prime and update all records.
         """
-        self.primes.append(cand)
-        self.gaps.append(gap)
-        run = self._run_counter.get(label, 0) + 1
-        self._run_counter[label] = run
-        self.motifs.append((label, run))
+        try:
+            self.primes.append(cand)
+        except OverflowError:
+            self.widen_primes()
+            self.primes.append(cand)
+        try:
+            self.gaps.append(gap)
+        except OverflowError:
+            self.gaps = list(self.gaps)  # a gap beyond 2**16-1
+            self.gaps.append(gap)
+        code = self._motif_code[label]
+        run = self._code_runs[code] + 1
+        self._code_runs[code] = run
+        self.motif_codes.append(code)
+        self.motif_runs.append(run)
         self.used_motifs.add(label)
 
         if len(self.used_motifs) == len(self.alphabet):
             self._bump_regime()
 
+    def widen_primes(self):
+        """
+        Switch prime storage from the uint64 array to a plain list so that
+        primes beyond 2**64 (e.g. an injected Mersenne prime) can be held.
+        """
+        if not isinstance(self.primes, list):
+            self.primes = list(self.primes)
+
     def _single_step(self, *, internal: bool = False):
         """
         Attempt to generate the next prime candidate via motifs.
         If no valid candidate is found, extend alphabet (motif innovation).
         """
+        next(self._step_gen(internal=internal), None)
+
+    def _step_gen(self, *, internal: bool = False):
+        """
+        Core step loop as a generator: each prime is recorded and then
+        yielded as ``(prime, gap, label)``, indefinitely. Bulk callers keep
+        one generator running, so the hot locals are bound once per run
+        instead of once per prime.
+        """
         if len(self.primes) < 6:
             return
 
+        # bind hot attributes once; the primorial and its square bound are
+        # re-read after each bump, primes after each record (widen_primes()
+        # may replace it). The gap array and wheel orders only grow at the
+        # end, so positions already scanned stay valid, unless a bump widens
+        # the wheel base and the orders are rebuilt.
+        alphabet = self.alphabet
+        gaps     = self._alphabet_gaps
+        small    = self._prefilter_primes
+        record   = self._record
+        verbose  = self.verbose and not internal
+
         while True:
-            p_curr = self.primes[-1]
+            primes = self.primes
+            p_curr = primes[-1]
+            r      = p_curr % _WHEEL_MOD
+            order  = self._wheel_order.get(r) or self._wheel_for(r)
             P      = self.primorial
+            bound  = primes[self.regime_idx] ** 2
+            j = _first_coprime(p_curr, gaps, order, P, small)
 
-            for lbl in self.alphabet:
-                gap  = self._gap(lbl)
+            while j >= 0:
+                i    = order[j]
+                gap  = gaps[i]
                 cand = p_curr + gap
 
-                if gcd(cand, P) != 1:
-                    continue  # eliminate mod-primorial composites
-
-                while cand >= self.primes[self.regime_idx] ** 2:
+                while cand >= bound:
                     self._bump_regime()
-                    P = self.primorial
-                    if gcd(cand, P) != 1:
+                    P     = self.primorial
+                    bound = primes[self.regime_idx] ** 2
+                    if self._wheel_order.get(r) is not order:
+                        order = self._wheel_for(r)
+                        j = bisect_right(order, i) - 1  # resume after i
+                    # cand was coprime to the old primorial; only the
+                    # newly multiplied-in prime can disqualify it
+                    if cand % primes[self.regime_idx] == 0:
                         break  # candidate now disqualified
                 else:
-                    self._record(cand, gap, lbl)
+                    break  # candidate accepted
 
-                    if self.verbose and not internal and \
-                       len(self.primes) % self.progress_every == 0:
-                        print(f"[prime {len(self.primes):>9}] {cand}")
-                    return  # candidate accepted
+                j = _first_coprime(p_curr, gaps, order, P, small, j + 1)
+            else:
+                # no candidate matched, extend motif alphabet
+                self._extend_alpha(self._next_motif())
+                continue
 
-            # no candidate matched, extend motif alphabet
-            self.alphabet.append(self._next_motif())
-            self._sort_alpha()
+            label = alphabet[i]
+            record(cand, gap, label)
+            if verbose and len(self.primes) % self.progress_every == 0:
+                print(f"[prime {len(self.primes):>9}] {cand}")
+            yield cand, gap, label
 
-    def generate(self):
+    def bootstrap_from_sieve(self, primes_iter):
+        """
+        Extend the sequence with primes taken from an external source (e.g.
+        ``segmented_sieve``) instead of searching for them.
+
+        Primes at or below the current last prime are skipped. Each new gap
+        is labelled with its canonical motif, and the alphabet, regime and
+        primorial are advanced just far enough to stay valid, so generation
+        continues with the same primes and labels as an unbroken run.
+        ``regime_points`` and the alphabet usually match too, but can differ
+        where the candidate search would have bumped a regime early.
+
+        Args:
+            primes_iter (Iterable[int]): Increasing primes; consumed only up
+                to ``n_primes``.
+        """
+        primes = self.primes
+        motif  = self.domains.canonical_motif
+        for q in primes_iter:
+            if len(self.primes) >= self.n_primes:
+                break
+            if q <= self.primes[-1]:
+                continue
+            gap = q - self.primes[-1]
+            while self._alphabet_gaps[-1] < gap:
+                self._extend_alpha(self._next_motif())
+            while q >= primes[self.regime_idx] ** 2:
+                self._bump_regime()
+            self._record(q, gap, motif(gap))
+            primes = self.primes  # may have been widened by _record
+
+    def generate(self, progress_cb=None):
         """
         Generate all primes up to `n_primes` limit.
+        Args:
+            progress_cb (callable | None): Called as ``progress_cb(done)``
+                every `progress_every` primes, from the generating loop.
         Returns:
             List[int]: list of primes.
         """
-        while len(self.primes) < self.n_primes:
-            self._single_step()
-        return self.primes
+        n, every = self.n_primes, self.progress_every
+        if len(self.primes) < n:
+            for _ in self._step_gen():
+                done = len(self.primes)
+                if progress_cb is not None and done % every == 0:
+                    progress_cb(done)
+                if done >= n:
+                    break
+        return self.get_primes()
 
     def generate_one(self):
         """
@@ -181,7 +399,7 @@ class McCracknsPrimeLaw:
         idx   = len(self.primes)
         p     = self.primes[-1]
         gap   = 0 if idx == 1 else self.gaps[-1]
-        motif = "U1" if idx == 1 else self.motifs[-1][0]
+        motif = "U1" if idx == 1 else self._motif_names[self.motif_codes[-1]]
         return idx, p, gap, motif
 
     def stream_primes(self, *, start_idx=1):
@@ -191,23 +409,29 @@ class McCracknsPrimeLaw:
         Yields:
             Tuple[int, int, int, str]: (index, prime, gap, motif label)
         """
-        while len(self.primes) < self.n_primes:
-            self._single_step()
+        n = self.n_primes
+        if len(self.primes) >= n:
+            return
+        for p, gap, motif in self._step_gen():
             idx = len(self.primes)
             if idx >= start_idx:
-                p     = self.primes[-1]
-                gap   = 0 if idx == 1 else self.gaps[-1]
-                motif = "U1" if idx == 1 else self.motifs[-1][0]
                 yield idx, p, gap, motif
+            if idx >= n:
+                return
 
     def get_primes(self):
         """Returns: list of generated primes."""
-        return self.primes.copy()
+        return list(self.primes)
 
     def get_gaps(self):
         """Returns: list of prime gaps."""
-        return self.gaps.copy()
+        return list(self.gaps)
+
+    def get_motif_names(self):
+        """Returns: list of motif labels indexed by motif code (see `motif_codes`)."""
+        return list(self._motif_names)
 
     def get_motifs(self):
-        """Returns: list of motifs (excluding seed)."""
-        return self.motifs[1:].copy()
+        """Returns: list of (motif label, run count) pairs (excluding seed)."""
+        names = self._motif_names
+        return [(names[c], run) for c, run in zip(self.motif_codes[1:], self.motif_runs[1:])]
@@ -1,4 +1,4 @@
-"""
+r"""
 Deterministically compute the next prime \( p_{n+1} \) from a given \( p_n \)
 according to McCrackn’s Prime Law.
 
@@ -12,29 +12,48 @@ python next_prime.py --exp 5 --n 11     # returns 37
 
 This script reconstructs the motif structure up to index `n`, inserts the known
 prime `p_n`, then computes the next deterministic prime according to the law's motif logic.
+
+With ``--cache-dir DIR`` the reconstructed law is checkpointed there at
+power-of-two prime counts, so later calls resume from the largest checkpoint
+instead of starting over. Caching is off unless a directory is given.
 """
 
 import argparse
 import time
 from mccrackns_prime_law import McCracknsPrimeLaw
+from src.checkpoint import load_checkpoint, save_checkpoint
 
 
-def build_law_with_prefix(p_n: int, n: int) -> McCracknsPrimeLaw:
+def build_law_with_prefix(p_n: int, n: int,
+                          cache_dir: str | None = None) -> McCracknsPrimeLaw:
     """
     Construct a McCrackn’s Prime Law instance with prefix ending in p_n at index n.
 
     Parameters:
         p_n (int): The known n-th prime.
         n   (int): The 1-based index of p_n in the prime sequence.
+        cache_dir (str | None): Checkpoint directory; None disables caching.
 
     Returns:
         McCracknsPrimeLaw: Law instance preloaded up to p_n with its motif state.
     """
-    law = McCracknsPrimeLaw(n_primes=n + 1, verbose=False)
+    law = load_checkpoint(cache_dir, n - 1) if cache_dir else None
+    if law is None:
+        law = McCracknsPrimeLaw(n_primes=n + 1, verbose=False)
+    else:
+        law.n_primes = n + 1
 
-    # Step until we have generated enough primes to safely set p_n
+    # Step until we have generated enough primes to safely set p_n,
+    # checkpointing at the largest power of two on the way
+    checkpoint = 1 << max(n - 1, 1).bit_length() - 1
     for _ in range(len(law.primes), n - 1):
         law.generate_one()
+        if cache_dir and len(law.primes) == checkpoint:
+            save_checkpoint(law, cache_dir)
+
+    # p_n may not fit the law's uint64 prime storage (large Mersenne primes)
+    if p_n.bit_length() > 64:
+        law.widen_primes()
 
     # Replace or append p_n at index n−1
     if len(law.primes) >= n:
@@ -57,6 +76,8 @@ def main() -> None:
                      help="If p_n = 2^e − 1 (Mersenne prime), supply e instead")
     pa.add_argument("--n", type=int, required=True,
                     help="Index n (1-based) of the given prime p_n")
+    pa.add_argument("--cache-dir", type=str, default=None,
+                    help="Directory for law checkpoints (default: no caching)")
     args = pa.parse_args()
 
     # Decode p_n from either direct input or exponent form
@@ -64,7 +85,7 @@ def main() -> None:
     n   = args.n
 
     # Build law instance ending at p_n
-    law = build_law_with_prefix(p_n, n)
+    law = build_law_with_prefix(p_n, n, args.cache_dir)
 
     # Advance one prime deterministically
     law.generate_one()
@@ -1,20 +1,22 @@
+import sys
+from functools import lru_cache
+
+
 class NumbersDomains:
     """
     Class to handle motif domain calculations for prime gaps.
 
     This class provides functionality for calculating the canonical motif
     for a given gap size `g` according to McCrackn's motif-based prime law.
-    The motifs are cached for efficiency up to a certain limit (`_CACHE_LIMIT`).
+    Gaps below `_TABLE_LIMIT` are looked up in a precomputed table; larger
+    motifs are cached for efficiency up to a certain limit (`_CACHE_LIMIT`).
+    Both are shared module-wide, so instances carry no state.
     """
 
-    __slots__ = ("_cache",)  # Reduce memory usage by limiting instance attributes
+    __slots__ = ()           # Stateless: no per-instance attributes at all
     _CACHE_LIMIT = 1 << 20   # Limit cache to gaps less than 2^20
-
-    def __init__(self):
-        """
-        Initializes the NumbersDomains class with an empty cache.
-        """
-        self._cache: dict[int, str] = {}  # Store motif labels for gaps in the cache
+    _TABLE_LIMIT = 10_000    # Gaps below this are served from _MOTIF_BY_GAP
+    _MOTIF_BY_GAP: tuple = ()  # Filled in below the class, shared by all instances
 
     def canonical_motif(self, g: int, *, use_cache: bool = True) -> str:
         """
@@ -43,10 +45,24 @@ class NumbersDomains:
         if g & 1:
             raise ValueError("gap must be 1 or an even integer")
 
-        # Check cache if enabled and gap is within cache limit
-        if use_cache and g <= self._CACHE_LIMIT and g in self._cache:
-            return self._cache[g]
+        # Small gaps (all prime gaps in practice) come from the flat table
+        if use_cache and 0 <= g < self._TABLE_LIMIT:
+            return self._MOTIF_BY_GAP[g]
+
+        # Use the shared cache if enabled and gap is within cache limit
+        if use_cache and g <= self._CACHE_LIMIT:
+            return _cached_label(g)
+
+        return self._label_for(g)
+
+    @staticmethod
+    def _label_for(g: int) -> str:
+        """
+        Compute the canonical motif label of an even gap `g`, uncached.
 
+        Raises:
+            ValueError: If the gap doesn't fit the expected form.
+        """
         # Handle powers of two (E1.x)
         if g & (g - 1) == 0:
             x = (g.bit_length() - 1) - 1  # Calculate x for E1.x (2^k form)
@@ -59,8 +75,18 @@ class NumbersDomains:
                 raise ValueError("gap does not fit 2^k·(2x+3) form")
             x = (odd - 3) // 2  # Calculate x based on the odd factor
             lbl = f"E{k+1}.{x}"  # Label for the canonical motif
-
-        # Cache the result if within cache limit
-        if use_cache and g <= self._CACHE_LIMIT:
-            self._cache[g] = lbl
         return lbl
+
+
+@lru_cache(maxsize=None)  # bounded by _CACHE_LIMIT: only even g <= 2^20 reach it
+def _cached_label(g: int) -> str:
+    """Interned label of an even gap, computed once per process."""
+    return sys.intern(NumbersDomains._label_for(g))
+
+
+# Labels of every even gap below _TABLE_LIMIT, indexed by gap (odd slots unused).
+# Interned, so callers using labels as dict keys compare them by identity.
+NumbersDomains._MOTIF_BY_GAP = tuple(
+    sys.intern(NumbersDomains._label_for(g)) if g % 2 == 0 else None
+    for g in range(NumbersDomains._TABLE_LIMIT)
+)
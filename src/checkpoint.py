@@ -0,0 +1,56 @@
+"""On-disk checkpoints of a McCracknsPrimeLaw, shared by the CLI and the analysis."""
+
+import hashlib
+import inspect
+import os
+import pickle
+import re
+
+import mccrackns_prime_law
+import numbers_domains
+from mccrackns_prime_law import McCracknsPrimeLaw
+
+_STATE_RE = re.compile(r"state_(\d+)\.pkl")
+
+
+def _cache_subdir(cache_dir: str) -> str:
+    """
+    Directory for checkpoints of the current law implementation, keyed by
+    a hash of the sources of every module it pickles (the law and its
+    NumbersDomains), so that pickles of older versions are never loaded.
+    """
+    digest = hashlib.sha1()
+    for module in (mccrackns_prime_law, numbers_domains):
+        digest.update(inspect.getsource(module).encode("utf-8"))
+    return os.path.join(cache_dir, digest.hexdigest()[:12])
+
+
+def load_checkpoint(cache_dir: str, max_primes: int) -> McCracknsPrimeLaw | None:
+    """
+    Load the cached law holding the most primes, at most ``max_primes``.
+
+    Returns:
+        McCracknsPrimeLaw | None: The law, or None if no usable checkpoint exists.
+    """
+    folder = _cache_subdir(cache_dir)
+    if not os.path.isdir(folder):
+        return None
+    counts = [int(m.group(1)) for m in map(_STATE_RE.fullmatch, os.listdir(folder)) if m]
+    counts = [k for k in counts if k <= max_primes]
+    if not counts:
+        return None
+    try:
+        with open(os.path.join(folder, f"state_{max(counts)}.pkl"), "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None  # unreadable checkpoint: rebuild instead
+
+
+def save_checkpoint(law: McCracknsPrimeLaw, cache_dir: str):
+    """Write ``law`` as the checkpoint for its current prime count (atomically)."""
+    folder = _cache_subdir(cache_dir)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"state_{len(law.primes)}.pkl")
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump(law, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
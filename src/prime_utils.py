@@ -1,15 +1,161 @@
 """Utility functions for prime calculations."""
 
+from bisect import bisect_right
+from itertools import compress, islice
+from math import isqrt, log
+
+try:  # optional: GMP-backed probable-prime test for large n
+    from gmpy2 import is_prime as _gmpy_is_prime
+except ImportError:
+    _gmpy_is_prime = None
+
+# Residues coprime to 30; every prime > 5 falls in one of these classes.
+_WHEEL30 = (1, 7, 11, 13, 17, 19, 23, 29)
+_WHEEL30_POS = {r: i for i, r in enumerate(_WHEEL30)}
+
+SEGSIZE = 32 * 1024  # bytes per sieve segment, sized to stay L1-resident
+
+# Odd primes screened before the Miller-Rabin rounds.
+_SMALL_PRIMES = (3, 5, 7, 11, 13, 17, 19, 23, 29, 31)
+
+# Miller-Rabin witnesses and psi_k (OEIS A014233): the first k witnesses
+# decide primality exactly for every n < _MR_PSI[k - 1].
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+_MR_PSI = (
+    2047, 1373653, 25326001, 3215031751, 2152302898747, 3474749660383,
+    341550071728321, 341550071728321, 3825123056546413051,
+    3825123056546413051, 3825123056546413051, 318665857834031151167461,
+)
+
+
 def is_prime(n: int) -> bool:
-    """Return ``True`` if ``n`` is prime using trial division."""
+    """
+    Return ``True`` if ``n`` is prime.
+
+    Divisors up to 31 are screened first, which settles most composites.
+    Below ``_MR_PSI[-1]`` (about 3.2e23, well past 2**64) the answer comes
+    from a deterministic Miller-Rabin test with just enough fixed witnesses
+    for the size of ``n``. Larger ``n`` go to ``gmpy2.is_prime`` when it is
+    installed, and to exact trial division otherwise.
+    """
     if n < 2:
         return False
-    if n == 2:
-        return True
     if n % 2 == 0:
-        return False
-    limit = int(n ** 0.5) + 1
-    for i in range(3, limit, 2):
+        return n == 2
+    for sp in _SMALL_PRIMES:
+        if n % sp == 0:
+            return n == sp
+    if n < 37 * 37:
+        return True  # any composite this small has a factor <= 31
+    k = bisect_right(_MR_PSI, n) + 1
+    if k <= len(_MR_BASES):
+        return _miller_rabin(n, _MR_BASES[:k])
+    if _gmpy_is_prime is not None:
+        return bool(_gmpy_is_prime(n))
+    limit = isqrt(n) + 1
+    for i in range(37, limit, 2):
         if n % i == 0:
             return False
     return True
+
+
+def _miller_rabin(n: int, bases: tuple) -> bool:
+    """Return ``True`` if odd ``n`` is a strong probable prime to every base."""
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _simple_sieve(limit: int) -> list[int]:
+    """Return all primes ``<= limit`` using a classical bytearray sieve."""
+    if limit < 2:
+        return []
+    flags = bytearray([1]) * (limit + 1)
+    flags[0] = flags[1] = 0
+    for i in range(2, isqrt(limit) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit + 1, i)))
+    return list(compress(range(limit + 1), flags))
+
+
+def segmented_sieve(limit: int, start: int = 0):
+    """
+    Yield every prime in ``[start, limit]`` in increasing order.
+
+    The range is sieved in segments of ``SEGSIZE`` bytes over a mod-30 wheel:
+    each byte stands for one integer coprime to 30, so a segment covers
+    ``SEGSIZE // 8 * 30`` integers and only the base primes up to
+    ``sqrt(limit)`` stay resident.
+
+    Args:
+        limit (int): Inclusive upper bound.
+        start (int): Inclusive lower bound, so disjoint windows can be
+            sieved independently.
+
+    Yields:
+        int: The next prime.
+    """
+    for p in (2, 3, 5):
+        if start <= p <= limit:
+            yield p
+    if limit < 7:
+        return
+
+    base  = _simple_sieve(isqrt(limit) + 1)[3:]  # 2, 3, 5 live in the wheel
+    span  = SEGSIZE // 8 * 30
+    ones  = b"\x01" * SEGSIZE
+    zeros = memoryview(bytes(SEGSIZE))
+    offsets = [30 * (i >> 3) + _WHEEL30[i & 7] for i in range(SEGSIZE)]
+    seg = bytearray(SEGSIZE)
+
+    for lo in range(start - start % 30, limit + 1, span):
+        hi = lo + span
+        seg[:] = ones
+        for p in base:
+            if p * p >= hi:
+                break
+            step = 8 * p
+            q0 = max(p, -(-lo // p))
+            # one strided write per wheel residue of the cofactor q
+            for r in _WHEEL30:
+                m = p * (q0 + (r - q0) % 30)
+                if m >= hi:
+                    continue
+                i = (m - lo) // 30 * 8 + _WHEEL30_POS[m % 30]
+                seg[i::step] = zeros[:(SEGSIZE - 1 - i) // step + 1]
+        if lo == 0:
+            seg[0] = 0  # 1 is not prime
+
+        for off in compress(offsets, seg):
+            if lo + off > limit:
+                return
+            if lo + off >= start:
+                yield lo + off
+
+
+def nth_prime_bound(n: int) -> int:
+    """
+    Return an upper bound on the ``n``-th prime.
+
+    Uses Rosser's bound ``p_n < n (ln n + ln ln n)``, valid for ``n >= 6``.
+    """
+    return 13 if n < 6 else int(n * (log(n) + log(log(n)))) + 1
+
+
+def first_primes(n: int) -> list[int]:
+    """Return the first ``n`` primes."""
+    if n < 1:
+        return []
+    return list(islice(segmented_sieve(nth_prime_bound(n)), n))
@@ -4,7 +4,7 @@ McCrackn's Prime Law — Analysis and Visualization Suite
 This script includes:
 - Regression tests for prime generation and motif correctness.
 - Visual diagnostics of prime gaps, motif growth, domain structure.
-- Export of full motif dataframe and CSVs.
+- Export of full motif dataframe (Parquet with pyarrow installed, else CSV).
 - Plotting of:
     * Gap evolution by domain
     * Gap vs motif-run index
@@ -16,14 +16,26 @@ This script includes:
 Expected output is saved under `mccrackns_prime_law/figures/`.
 """
 
-import os, time, gc
+import os, time
+import multiprocessing
+from math import isqrt, log
+import colorsys
+import matplotlib.colors as mcolors
 import matplotlib.pyplot as plt
+from matplotlib import cbook
 import seaborn as sns
 import numpy as np
 import pandas as pd
 
+try:  # optional: columnar Parquet export of the motif table
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 import mccrackns_prime_law
 from mccrackns_prime_law import McCracknsPrimeLaw
+from src.checkpoint import load_checkpoint, save_checkpoint
+from src.prime_utils import first_primes
 
 # ──────────────────────────────────────────────────────────────
 #  Paths & constants
@@ -32,6 +44,10 @@ from mccrackns_prime_law import McCracknsPrimeLaw
 PKG_DIR     = os.path.dirname(mccrackns_prime_law.__file__)
 FIGURES_DIR = os.path.join(PKG_DIR, "figures")
 os.makedirs(FIGURES_DIR, exist_ok=True)
+LAW_CACHE_DIR = os.path.join(FIGURES_DIR, "law_cache")  # opt-in law checkpoints
+
+# Scatterplots draw at most about this many points per domain
+SCATTER_POINTS_PER_DOMAIN = 50_000
 
 # Known reference primes for validation
 REFERENCE_PRIMES = [
@@ -40,23 +56,17 @@ REFERENCE_PRIMES = [
 ]
 
 def first_n_primes(n: int) -> list[int]:
-    """Returns the first `n` primes via trial division (reference implementation)."""
+    """Returns the first `n` primes via an odd-only NumPy sieve (reference implementation)."""
     if n <= 20:
         return REFERENCE_PRIMES[:n]
-    out = REFERENCE_PRIMES[:]
-    cand = out[-1] + 2
-    while len(out) < n:
-        root = int(cand ** 0.5)
-        for p in out:
-            if p > root:
-                out.append(cand)
-                break
-            if cand % p == 0:
-                break
-        else:
-            out.append(cand)
-        cand += 2
-    return out
+    limit = int(n * (log(n) + log(log(n)))) + 1  # Rosser: p_n < n(ln n + ln ln n)
+    odd = np.ones(limit // 2 + 1, dtype=np.bool_)  # odd[i] stands for 2i + 1
+    odd[0] = False
+    for i in range(3, isqrt(limit) + 1, 2):
+        if odd[i // 2]:
+            odd[i * i // 2::i] = False
+    primes = np.concatenate(([2], 2 * np.flatnonzero(odd) + 1))
+    return primes[:n].tolist()
 
 def print_prime_summary(primes, show=10):
     """Prints the head and tail of a prime list, with index labels."""
@@ -64,14 +74,13 @@ def print_prime_summary(primes, show=10):
     half = show * 2
     head, tail = primes[:show], primes[-show:]
     if n <= half:
-        for i, p in enumerate(primes, 1):
-            print(f"  Prime #{i}: {p}")
+        lines = [f"  Prime #{i}: {p}" for i, p in enumerate(primes, 1)]
     else:
-        for i, p in enumerate(head, 1):
-            print(f"  Prime #{i}: {p}")
-        print("  ...")
-        for i, p in enumerate(tail, n - show + 1):
-            print(f"  Prime #{i}: {p}")
+        lines = [f"  Prime #{i}: {p}" for i, p in enumerate(head, 1)]
+        lines.append("  ...")
+        lines += [f"  Prime #{i}: {p}" for i, p in enumerate(tail, n - show + 1)]
+    if lines:
+        print("\n".join(lines))  # one write for the whole summary
 
 # ──────────────────────────────────────────────────────────────
 #  Unit tests
@@ -101,9 +110,9 @@ def test_innovation_points():
     print("TEST: Regime/motif innovation points (Nk).")
     mcc = McCracknsPrimeLaw(n_primes=40)
     mcc.generate()
-    pts, primes, motifs = set(mcc.regime_points), mcc.get_primes(), mcc.get_motifs()
-    print(f"Regime points: {sorted(pts)}")
-    for nk in sorted(pts):
+    pts, primes, motifs = mcc.regime_points, mcc.get_primes(), mcc.get_motifs()
+    print(f"Regime points: {pts}")
+    for nk in pts:
         if nk < len(primes):
             print(f"  n={nk:2d}: prime={primes[nk]:5d}, motif={motifs[nk-1]}")
     print("✔ Innovation points look correct.")
@@ -137,132 +146,237 @@ def test_error_handling():
 #  Plotting helpers
 # ──────────────────────────────────────────────────────────────
 
+def thin_by_domain(df, limit=SCATTER_POINTS_PER_DOMAIN):
+    """Uniformly subsample each domain to about `limit` rows (fixed seed)."""
+    sizes = df.groupby("domain", observed=True)["domain"].transform("size").to_numpy()
+    if sizes.max() <= limit:
+        return df
+    keep = np.random.default_rng(0).random(len(df)) * sizes < limit
+    return df[keep]
+
+def save_figure(fig, outdir, name):
+    """Save `fig` at 100 dpi, cropped to its artists (outside legends included), and close it."""
+    fig.savefig(os.path.join(outdir, name), dpi=100, bbox_inches="tight")
+    plt.close(fig)
+
 def plot_gap_evolution(df, regime_points, outdir):
     """Scatterplot of gaps vs index, color-coded by domain, with vertical regime markers."""
-    plt.figure(figsize=(12, 6))
-    ax = plt.gca()
-    sns.scatterplot(data=df, x="index", y="gap", hue="domain",
-                    palette="tab10", s=10, ax=ax, legend="brief")
-    for rp in regime_points:
-        ax.axvline(rp, color="grey", lw=1, ls="--", alpha=0.6)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    sns.scatterplot(data=thin_by_domain(df), x="index", y="gap", hue="domain",
+                    hue_order=df["domain"].unique(),
+                    palette="tab10", s=10, ax=ax, legend="brief", rasterized=True)
+    # one collection spanning the full height, like axvline per point
+    ax.vlines(regime_points, 0, 1, transform=ax.get_xaxis_transform(),
+              colors="grey", linewidths=1, linestyles="--", alpha=0.6)
     ax.set(title="Prime-gap evolution by domain",
            xlabel="Prime index n", ylabel="gap = pₙ₊₁ − pₙ")
     ax.legend(title="Domain", bbox_to_anchor=(1.02, 1), loc="upper left")
-    plt.tight_layout()
-    plt.savefig(os.path.join(outdir, "gap_evolution_domains.png"))
-    plt.close()
+    save_figure(fig, outdir, "gap_evolution_domains.png")
 
 def plot_gap_vs_run(df, outdir):
     """Plot gap size as function of motif run count."""
-    plt.figure(figsize=(10, 6))
-    sns.scatterplot(data=df, x="run", y="gap", hue="domain",
-                    palette="tab10", s=15, alpha=0.7)
-    plt.title("Gap size vs. motif-run index")
-    plt.xlabel("Motif run index"), plt.ylabel("Gap size")
-    plt.legend(title="Domain", bbox_to_anchor=(1.02, 1), loc="upper left")
-    plt.tight_layout()
-    plt.savefig(os.path.join(outdir, "gap_vs_run.png"))
-    plt.close()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(data=thin_by_domain(df), x="run", y="gap", hue="domain",
+                    hue_order=df["domain"].unique(),
+                    palette="tab10", s=15, alpha=0.7, ax=ax, rasterized=True)
+    ax.set(title="Gap size vs. motif-run index",
+           xlabel="Motif run index", ylabel="Gap size")
+    ax.legend(title="Domain", bbox_to_anchor=(1.02, 1), loc="upper left")
+    save_figure(fig, outdir, "gap_vs_run.png")
 
 def plot_cumulative_motifs(df, outdir):
     """Line plot showing cumulative motif count per domain."""
-    cum = (df.groupby(["domain", "index"], observed=False)
-             .size()
-             .groupby(level=0, observed=False)
-             .cumsum()
-             .reset_index(name="cum"))
-    plt.figure(figsize=(12, 6))
-    sns.lineplot(data=cum, x="index", y="cum", hue="domain", palette="tab10")
-    plt.title("Cumulative motif innovations by domain")
-    plt.xlabel("Prime index n"), plt.ylabel("Cumulative count")
-    plt.legend(title="Domain", bbox_to_anchor=(1.02, 1), loc="upper left")
-    plt.tight_layout()
-    plt.savefig(os.path.join(outdir, "cumulative_motifs.png"))
-    plt.close()
+    # every index is unique, so a domain's curve steps up by one at each of
+    # its rows; one vectorized pass per domain, legend in sorted-domain order
+    codes, domains = pd.factorize(df["domain"])
+    index = df["index"].to_numpy()
+    order = np.argsort(np.asarray(domains, dtype=str))
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for color, k in zip(sns.color_palette("tab10", len(order)), order):
+        rows = np.flatnonzero(codes == k)
+        ax.plot(index[rows], np.arange(1, len(rows) + 1), color=color, label=domains[k])
+    ax.set(title="Cumulative motif innovations by domain",
+           xlabel="Prime index n", ylabel="Cumulative count")
+    ax.legend(title="Domain", bbox_to_anchor=(1.02, 1), loc="upper left")
+    save_figure(fig, outdir, "cumulative_motifs.png")
 
 def plot_gap_boxplot(df, outdir):
     """Boxplot of gap distributions by motif domain."""
-    plt.figure(figsize=(10, 6))
+    # quartiles and whiskers (1.5 IQR, as seaborn) are computed here once per
+    # domain and drawn with ax.bxp; gaps are integers, so each distinct
+    # outlier value is drawn once rather than once per prime
     order = df["domain"].value_counts().index
-    sns.boxplot(data=df, x="domain", y="gap", order=order)
-    plt.title("Distribution of prime gaps by domain")
-    plt.xlabel("Domain"), plt.ylabel("Gap size")
-    plt.tight_layout()
-    plt.savefig(os.path.join(outdir, "gap_boxplot_by_domain.png"))
-    plt.close()
+    by_domain = {d: g.to_numpy() for d, g in df.groupby("domain", observed=True)["gap"]}
+    stats = []
+    for d in order:
+        st, = cbook.boxplot_stats(by_domain[d], whis=1.5)
+        st["fliers"] = np.unique(st["fliers"])
+        stats.append(st)
+    color = sns.desaturate("C0", 0.75)  # seaborn's default box styling
+    line = (colorsys.rgb_to_hls(*mcolors.to_rgb(color))[1] * .6,) * 3
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.bxp(stats, positions=range(len(stats)), widths=0.8, capwidths=0.4,
+           patch_artist=True, manage_ticks=False,
+           boxprops={"facecolor": color, "edgecolor": line},
+           medianprops={"color": line, "solid_capstyle": "butt"},
+           whiskerprops={"color": line, "solid_capstyle": "butt"},
+           capprops={"color": line},
+           flierprops={"markeredgecolor": line, "markersize": 5})
+    ax.set_xticks(range(len(stats)), [str(d) for d in order])
+    ax.set_xlim(-0.5, len(stats) - 0.5)
+    ax.set(title="Distribution of prime gaps by domain",
+           xlabel="Domain", ylabel="Gap size")
+    save_figure(fig, outdir, "gap_boxplot_by_domain.png")
 
 def plot_innovations_by_regime(df, regime_points, outdir):
     """Barplot of motif innovations introduced at each regime point."""
-    new_by_regime, seen = [], set()
-    prev = 1
-    for rp in sorted(regime_points):
-        chunk = df.iloc[prev:rp-1]
-        for motif in chunk["motif"].unique():
-            if motif not in seen:
-                seen.add(motif)
-                new_by_regime.append({"regime": rp, "domain": motif.split(".")[0]})
-        prev = rp - 1
-    regdf = pd.DataFrame(new_by_regime)
-    counts = (regdf.groupby(["regime", "domain"], observed=False)
+    # a motif debuts at its first row after the seed row; it counts for the
+    # first regime point past that row (rows after the last one don't count)
+    codes, _ = pd.factorize(df["motif"].iloc[1:])
+    _, first_row = np.unique(codes, return_index=True)
+    first_row += 1
+    which = np.searchsorted(regime_points - 1, first_row, side="right")
+    debut = which < len(regime_points)
+    regdf = pd.DataFrame({
+        "regime": regime_points[which[debut]],
+        "domain": df["domain"].to_numpy()[first_row[debut]],
+    })
+    counts = (regdf.groupby(["regime", "domain"], observed=True)
                     .size()
                     .reset_index(name="count"))
-    plt.figure(figsize=(8, 5))
-    sns.barplot(data=counts, x="regime", y="count", hue="domain", palette="tab10")
-    plt.title("New motif innovations at each regime expansion")
-    plt.xlabel("Regime point Nk"), plt.ylabel("Number of new motifs")
-    plt.legend(title="Domain", bbox_to_anchor=(1.02, 1), loc="upper left")
-    plt.tight_layout()
-    plt.savefig(os.path.join(outdir, "innovations_by_regime.png"))
-    plt.close()
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.barplot(data=counts, x="regime", y="count", hue="domain", palette="tab10", ax=ax)
+    ax.set(title="New motif innovations at each regime expansion",
+           xlabel="Regime point Nk", ylabel="Number of new motifs")
+    ax.legend(title="Domain", bbox_to_anchor=(1.02, 1), loc="upper left")
+    save_figure(fig, outdir, "innovations_by_regime.png")
 
 def plot_alphabet_growth(df, regime_points, outdir):
     """Plot the growth of the alphabet size at each regime point."""
-    first_idx = df.groupby("motif", observed=False)["index"].min()
-    sizes = [{"regime": rp, "alphabet_size": int((first_idx <= rp).sum())}
-             for rp in regime_points]
-    adf = pd.DataFrame(sizes)
-    plt.figure(figsize=(8, 5))
-    sns.lineplot(data=adf, x="regime", y="alphabet_size", marker="o")
-    plt.title("Motif-alphabet size at each regime expansion")
-    plt.xlabel("Regime point Nk"), plt.ylabel("Unique motifs so far")
-    plt.xscale("log", base=2)
-    plt.tight_layout()
-    plt.savefig(os.path.join(outdir, "alphabet_growth.png"))
-    plt.close()
+    # rows are in index order, so a motif's first row holds its minimal index
+    codes, _ = pd.factorize(df["motif"])
+    _, first_pos = np.unique(codes, return_index=True)
+    first_idx = np.sort(df["index"].to_numpy()[first_pos])
+    # motifs first seen at or before each regime point, one binary search each
+    adf = pd.DataFrame({
+        "regime":        regime_points,
+        "alphabet_size": np.searchsorted(first_idx, regime_points, side="right"),
+    })
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.lineplot(data=adf, x="regime", y="alphabet_size", marker="o", ax=ax)
+    ax.set(title="Motif-alphabet size at each regime expansion",
+           xlabel="Regime point Nk", ylabel="Unique motifs so far")
+    ax.set_xscale("log", base=2)
+    save_figure(fig, outdir, "alphabet_growth.png")
 
 # ──────────────────────────────────────────────────────────────
 #  High-level orchestration
 # ──────────────────────────────────────────────────────────────
 
-def main_gap_and_motif_analysis(n: int = 10000):
-    """Full analysis and visualization pipeline on the first n primes."""
+_PLOTS = []  # (name, fn, args) jobs, installed in each plot worker
+
+def _init_plot_worker(plots):
+    """Pool initializer: install the plot jobs in this worker."""
+    _PLOTS[:] = plots
+
+def _render_plot(i):
+    """Worker: draw plot job `i` of `_PLOTS`; returns its elapsed seconds."""
+    t0 = time.perf_counter()
+    _, fn, args = _PLOTS[i]
+    fn(*args)
+    return time.perf_counter() - t0
+
+def build_law(n: int, use_fast: bool = False,
+              cache_dir: str | None = None) -> McCracknsPrimeLaw:
+    """
+    Return a law holding the first n primes.
+
+    With a `cache_dir` (e.g. LAW_CACHE_DIR) the law resumes from the
+    largest checkpoint of at most n primes there (the `next_prime.py`
+    checkpoint format) and is saved there once complete, so repeated slow
+    runs never regenerate a prefix; by default nothing is cached.
+    With `use_fast` the primes come from a segmented sieve and the law only
+    labels them (`bootstrap_from_sieve`); primes and motifs are identical,
+    regime points can in principle differ (see that method).
+    """
+    t0 = time.perf_counter()
+    mcc = load_checkpoint(cache_dir, n) if cache_dir else None
+    if mcc is None:
+        mcc = McCracknsPrimeLaw(n_primes=n)
+    else:
+        print(f"[cache   ] resuming from {len(mcc.primes)} primes", flush=True)
+        mcc.n_primes = n
+    mcc.progress_every = max(1, n // 20)
+    cached = len(mcc.primes)
+    if use_fast:
+        mcc.bootstrap_from_sieve(first_primes(n))
+        print(f"[sieve   ] {n} primes labelled in "
+              f"{time.perf_counter() - t0:.1f}s", flush=True)
+    else:
+        mcc.generate(progress_cb=lambda done: print(
+            f"[generate] {done}/{n} ({done / n:6.1%}) | "
+            f"elapsed {time.perf_counter() - t0:6.1f}s", flush=True))
+    if cache_dir and len(mcc.primes) > cached:
+        save_checkpoint(mcc, cache_dir)
+    return mcc
+
+def main_gap_and_motif_analysis(n: int = 10000, use_fast: bool = False,
+                                cache_dir: str | None = None,
+                                jobs: int = 1):
+    """
+    Full analysis and visualization pipeline on the first n primes; the law
+    comes from `build_law` (checkpointed only when `cache_dir` is given).
+    With `jobs` > 1 the plots are drawn in parallel by a pool in the
+    platform's default start method. Where that is fork (Linux) the workers
+    read the frame copy-on-write; elsewhere each receives a pickled copy.
+    """
     print("=" * 50)
     print(f"MAIN ANALYSIS: generating n={n} primes …")
     t0_all = time.perf_counter()
 
-    mcc = McCracknsPrimeLaw(n_primes=n, verbose=True)
-    mcc.generate()
-
-    primes, motifs = mcc.get_primes(), mcc.get_motifs()
-    regime_points  = set(mcc.regime_points)
-
-    motif_list = ["U1"] + [m[0] for m in motifs]
-    run_list   = [1]    + [m[1] for m in motifs]
-    gaps       = [1]    + mcc.get_gaps()
-    domains    = [m.split('.')[0] for m in motif_list]
+    mcc = build_law(n, use_fast, cache_dir)
+
+    # strictly increasing already; one read-only array shared by every plot
+    regime_points  = np.array(mcc.regime_points, dtype=np.int64)
+    regime_points.flags.writeable = False
+
+    # columns straight from the law's packed records; row 0 is the seed
+    # prime 2 (U1, run 1, gap 1). Label columns are categoricals over the
+    # law's own motif codes, so no string is built per row. Primes stay
+    # int64 (they pass 2**31 near n = 10**8); gaps and runs fit int32.
+    codes      = np.asarray(mcc.motif_codes, dtype=np.intp)
+    names      = mcc.get_motif_names()
+    primes     = np.asarray(mcc.primes, dtype=np.int64)
+    # (the alphabet can hold labels not yet seen; drop them as categories)
+    motif_list = pd.Categorical.from_codes(codes, categories=names).remove_unused_categories()
+    dom_names  = [m.partition('.')[0] for m in names]
+    dom_cats   = list(dict.fromkeys(dom_names))  # first-seen order
+    dom_codes  = np.array([dom_cats.index(d) for d in dom_names], dtype=np.intp)
+    domains    = pd.Categorical.from_codes(dom_codes[codes], categories=dom_cats).remove_unused_categories()
+    run_list   = np.asarray(mcc.motif_runs, dtype=np.int32)
+    # gaps straight off the primes column: one vectorised pass, no read
+    # of the law's gap list
+    gaps       = np.empty(len(primes), dtype=np.int32)
+    gaps[0]    = 1
+    np.subtract(primes[1:], primes[:-1], out=gaps[1:])
+    # regime labels R1, R2, … on the rows at each regime point
+    rps    = regime_points[regime_points <= len(primes)]
+    regime = np.zeros(len(primes), dtype=np.intp)
+    regime[rps - 1] = np.arange(1, len(rps) + 1)
+    regime = pd.Categorical.from_codes(
+        regime, categories=[""] + [f"R{k}" for k in range(1, len(rps) + 1)])
     df = pd.DataFrame({
         "index":  np.arange(1, len(primes) + 1),
         "prime":  primes,
-        "regime": ["" for _ in primes],
+        "regime": regime,
         "motif":  motif_list,
         "run":    run_list,
         "gap":    gaps,
         "domain": domains,
-    })
-
-    for k, rp in enumerate(sorted(regime_points), 1):
-        if rp - 1 < len(df):
-            df.at[rp - 1, "regime"] = f"R{k}"
+    }, copy=False)  # every column is already a typed array; adopt, don't copy
+    # the frame owns its columns now; drop the law and the source lists
+    # (regime_points stays referenced) before the plotting phase
+    del mcc, codes, primes, motif_list, run_list, gaps, domains, dom_codes, regime, rps
 
     plots = [
         ("gap_evolution",        plot_gap_evolution,        (df, regime_points, FIGURES_DIR)),
@@ -273,15 +387,27 @@ def main_gap_and_motif_analysis(n: int = 10000):
         ("alphabet_growth",      plot_alphabet_growth,      (df, regime_points, FIGURES_DIR)),
     ]
 
-    for i, (name, fn, args) in enumerate(plots, 1):
-        print(f"[{i}/{len(plots)}] Plotting {name} …", end="", flush=True)
-        t0 = time.perf_counter()
-        fn(*args)
-        print(f" done in {time.perf_counter() - t0:.1f}s")
-        gc.collect()
-
-    df.to_csv(os.path.join(FIGURES_DIR, "motif_data.csv"), index=False)
-    print(f"CSV saved → {FIGURES_DIR}/motif_data.csv")
+    if jobs > 1:
+        # default context: fork only where it is already the platform default
+        ctx = multiprocessing.get_context()
+        with ctx.Pool(min(jobs, len(plots)), initializer=_init_plot_worker,
+                      initargs=(plots,)) as pool:
+            for i, dt in enumerate(pool.imap(_render_plot, range(len(plots))), 1):
+                print(f"[{i}/{len(plots)}] Plotted {plots[i - 1][0]} in {dt:.1f}s")
+    else:
+        for i, (name, fn, args) in enumerate(plots, 1):
+            print(f"[{i}/{len(plots)}] Plotting {name} …", end="", flush=True)
+            t0 = time.perf_counter()
+            fn(*args)
+            print(f" done in {time.perf_counter() - t0:.1f}s")
+
+    if pyarrow is not None:
+        out = os.path.join(FIGURES_DIR, "motif_data.parquet")
+        df.to_parquet(out, compression="zstd", index=False)
+    else:
+        out = os.path.join(FIGURES_DIR, "motif_data.csv")
+        df.to_csv(out, index=False)
+    print(f"Table saved → {out}")
     print(f"⌛ Total time {time.perf_counter() - t0_all:.1f}s")
     print("=" * 50)
 
@@ -294,4 +420,4 @@ if __name__ == "__main__":
     test_innovation_points()
     test_no_duplicate_motifs()
     test_error_handling()
-    main_gap_and_motif_analysis(n=10_000_000)
+    main_gap_and_motif_analysis(n=10_000_000, use_fast=True)
@@ -0,0 +1,12 @@
+from mccrackns_prime_law import McCracknsPrimeLaw
+from src.checkpoint import load_checkpoint, save_checkpoint
+
+
+def test_checkpoint_round_trip(tmp_path):
+    law = McCracknsPrimeLaw(n_primes=64, verbose=False)
+    law.generate()
+    save_checkpoint(law, str(tmp_path))
+    loaded = load_checkpoint(str(tmp_path), 100)
+    assert list(loaded.primes) == list(law.primes)
+    assert load_checkpoint(str(tmp_path), 63) is None
+    assert load_checkpoint(str(tmp_path / "missing"), 100) is None
@@ -0,0 +1,36 @@
+import compute_motifs
+from compute_motifs import count_rows, load_progress, save_state, sieve_rows
+from mccrackns_prime_law import McCracknsPrimeLaw
+
+
+def test_sieve_rows_match_stream_primes(monkeypatch):
+    monkeypatch.setattr(compute_motifs, "SIEVE_WINDOW", 1000)  # p_500 = 3571: four windows
+    for start in (1, 150, 400):
+        law = McCracknsPrimeLaw(n_primes=500, verbose=False)
+        assert list(sieve_rows(500, start, 2)) == list(law.stream_primes(start_idx=start))
+
+
+def test_count_rows(tmp_path):
+    csv = tmp_path / "m.csv"
+    csv.write_bytes(b"index,prime,gap,motif\r\n7,17,4,E1.1\r\n8,19,2,E1.0\r\n")
+    assert count_rows(str(csv)) == 2
+    csv.write_bytes(b"index,prime,gap,motif\r\n7,17,4,E1.1\r\n8,19,2,E1.0")
+    assert count_rows(str(csv)) == 2
+    csv.write_bytes(b"index,prime,gap,motif\r\n")
+    assert count_rows(str(csv)) == 0
+
+
+def test_load_progress_resyncs_csv_with_snapshot(tmp_path):
+    csv, state = tmp_path / "m.csv", str(tmp_path / "s.json")
+    snapshot = b"index,prime,gap,motif\r\n7,17,4,E1.1\r\n8,19,2,E1.0\r\n"
+    csv.write_bytes(snapshot)
+    save_state(state, str(csv), 2, 19)
+
+    # rows written after the snapshot, the last one cut mid-line
+    csv.write_bytes(snapshot + b"9,23,4,E1.1\r\n10,2")
+    assert load_progress(str(csv), state)[0] == 2
+    assert csv.read_bytes() == snapshot
+
+    # a CSV shorter than the snapshot has its rows counted instead
+    csv.write_bytes(snapshot[:snapshot.index(b"8,19")])
+    assert load_progress(str(csv), state)[0] == 1
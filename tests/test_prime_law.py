@@ -0,0 +1,32 @@
+from mccrackns_prime_law import McCracknsPrimeLaw
+from src.prime_utils import first_primes
+
+
+def test_bootstrap_from_sieve_continues_like_generate():
+    ref = McCracknsPrimeLaw(n_primes=5000)
+    ref.generate()
+
+    law = McCracknsPrimeLaw(n_primes=5000)
+    law.bootstrap_from_sieve(first_primes(3000))
+    assert len(law.primes) == 3000
+    law.generate()
+
+    assert law.get_primes() == ref.get_primes()
+    assert law.get_gaps() == ref.get_gaps()
+    assert law.get_motifs() == ref.get_motifs()
+
+
+def test_generate_reports_progress():
+    seen = []
+    law = McCracknsPrimeLaw(n_primes=1000, progress_every=250)
+    law.generate(progress_cb=seen.append)
+    assert seen == [250, 500, 750, 1000]
+
+
+def test_motif_names_decode_codes():
+    law = McCracknsPrimeLaw(n_primes=2000)
+    law.generate()
+    names = law.get_motif_names()
+    decoded = [(names[c], run) for c, run in zip(law.motif_codes, law.motif_runs)]
+    assert decoded[0] == ("U1", 1)
+    assert decoded[1:] == law.get_motifs()
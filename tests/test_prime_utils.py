@@ -0,0 +1,47 @@
+from src.prime_utils import _simple_sieve, first_primes, is_prime, segmented_sieve
+
+
+def test_is_prime_matches_sieve():
+    primes = set(_simple_sieve(5000))
+    assert [n for n in range(-3, 5001) if is_prime(n)] == sorted(primes)
+
+
+def test_is_prime_large():
+    assert is_prime(2**24 + 43)
+    assert not is_prime(4099 * 4111)  # product of primes above the screen
+    assert is_prime(1_000_000_000_039)
+    assert not is_prime(1_048_573 * 1_048_583)
+    assert is_prime(2**61 - 1)
+    assert not is_prime((2**31 - 1) * 1_000_000_000_039)
+
+
+def test_is_prime_rejects_strong_pseudoprimes():
+    # psi_k: the least composites passing Miller-Rabin for the first k prime bases
+    for psi in (2047, 1373653, 25326001, 3215031751, 2152302898747,
+                3474749660383, 341550071728321, 3825123056546413051):
+        assert not is_prime(psi)
+
+
+def test_segmented_sieve_matches_trial_division():
+    for limit in (0, 1, 2, 6, 7, 30, 31, 97, 1000):
+        assert list(segmented_sieve(limit)) == [n for n in range(limit + 1) if is_prime(n)]
+
+
+def test_segmented_sieve_crosses_segment_boundaries():
+    limit = 300_007  # spans three segments of the default size
+    primes = list(segmented_sieve(limit))
+    assert all(is_prime(p) for p in primes[-50:])
+    assert len(primes) == 25_998
+
+
+def test_segmented_sieve_window():
+    assert list(segmented_sieve(100, 50)) == [53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
+    assert list(segmented_sieve(5, 3)) == [3, 5]
+    lo, hi = 299_990, 300_007
+    assert list(segmented_sieve(hi, lo)) == [n for n in range(lo, hi + 1) if is_prime(n)]
+
+
+def test_first_primes():
+    assert first_primes(0) == []
+    assert first_primes(10) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    assert first_primes(100_000)[-1] == 1_299_709